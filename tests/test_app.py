@@ -2,42 +2,95 @@
 Tests for the Mergington High School Activities API
 """
 
+import asyncio
+from urllib.parse import quote
+
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app, activities
+import pytest_asyncio
 
 
-@pytest.fixture
+def signup_url(activity, email):
+    """Build the signup URL for an activity and email"""
+    return f"/activities/{quote(activity, safe='')}/signup?email={quote(email)}"
+
+
+def participant_url(activity, email):
+    """Build the URL of a participant within an activity"""
+    return f"/activities/{quote(activity, safe='')}/participants/{quote(email, safe='')}"
+
+
+def assert_ok_message(response, *needles):
+    """Assert a 200 response with a message containing every needle"""
+    assert response.status_code == 200
+    assert b'"message"' in response.content
+    for needle in needles:
+        assert needle.encode() in response.content
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+    """Create a single test client for the FastAPI app, shared across tests"""
+    # Imported here so collection doesn't pay for importing the app
+    from fastapi.testclient import TestClient
+    from src.app import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest_asyncio.fixture
+async def async_client():
+    """Create an async client for issuing concurrent requests to the app"""
+    import httpx
+    from src.app import app
+
+    # Function scoped: each async test runs on its own event loop, and the
+    # client is cheap to build because ASGITransport runs no lifespan
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+# Baseline activities restored before each test
+_BASELINE = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    }
+}
 
 
 @pytest.fixture(autouse=True)
 def reset_activities():
     """Reset activities database before each test"""
-    global activities
+    from src.app import activities
+
+    # Mutate in place: the app and the activities fixture share this dict
     activities.clear()
-    activities.update({
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    })
+    for name, details in _BASELINE.items():
+        # Copy the participants list so tests can't mutate the baseline
+        activities[name] = {**details, "participants": list(details["participants"])}
+
+
+@pytest.fixture
+def activities():
+    """Return the app's in-memory activities database"""
+    from src.app import activities
+    return activities
 
 
 class TestRootEndpoint:
@@ -59,9 +112,7 @@ class TestGetActivities:
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 3
-        assert "Chess Club" in data
-        assert "Programming Class" in data
-        assert "Gym Class" in data
+        assert data.keys() >= {"Chess Club", "Programming Class", "Gym Class"}
 
     def test_get_activities_structure(self, client):
         """Test that activities have the correct structure"""
@@ -69,10 +120,7 @@ class TestGetActivities:
         data = response.json()
         
         chess_club = data["Chess Club"]
-        assert "description" in chess_club
-        assert "schedule" in chess_club
-        assert "max_participants" in chess_club
-        assert "participants" in chess_club
+        assert chess_club.keys() >= {"description", "schedule", "max_participants", "participants"}
         assert isinstance(chess_club["participants"], list)
 
     def test_get_activities_returns_participants(self, client):
@@ -83,50 +131,42 @@ class TestGetActivities:
         assert len(data["Chess Club"]["participants"]) == 2
         assert "michael@mergington.edu" in data["Chess Club"]["participants"]
 
+    def test_get_activities_reflects_latest_state(self, client):
+        """Test that repeated GETs are never served stale after a mutation"""
+        first = client.get("/activities").json()
+        client.post(signup_url("Chess Club", "test@mergington.edu"))
+        second = client.get("/activities").json()
+
+        assert "test@mergington.edu" not in first["Chess Club"]["participants"]
+        assert "test@mergington.edu" in second["Chess Club"]["participants"]
+
 
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
 
     def test_signup_for_valid_activity(self, client):
         """Test signing up for a valid activity"""
-        response = client.post(
-            "/activities/Chess%20Club/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "test@mergington.edu" in data["message"]
-        assert "Chess Club" in data["message"]
+        response = client.post(signup_url("Chess Club", "test@mergington.edu"))
+        assert_ok_message(response, "test@mergington.edu", "Chess Club")
 
-    def test_signup_adds_participant_to_activity(self, client):
+    def test_signup_adds_participant_to_activity(self, client, activities):
         """Test that signup actually adds participant to the activity"""
-        client.post("/activities/Chess%20Club/signup?email=test@mergington.edu")
+        client.post(signup_url("Chess Club", "test@mergington.edu"))
         
         # Verify participant was added
-        response = client.get("/activities")
-        data = response.json()
-        assert "test@mergington.edu" in data["Chess Club"]["participants"]
-
-    def test_signup_for_nonexistent_activity(self, client):
-        """Test signing up for an activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent%20Club/signup?email=test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "detail" in data
-        assert "Activity not found" in data["detail"]
+        assert "test@mergington.edu" in activities["Chess Club"]["participants"]
 
-    def test_signup_multiple_students(self, client):
+    @pytest.mark.asyncio
+    async def test_signup_multiple_students(self, async_client, activities):
         """Test signing up multiple students for the same activity"""
-        client.post("/activities/Chess%20Club/signup?email=student1@mergington.edu")
-        client.post("/activities/Chess%20Club/signup?email=student2@mergington.edu")
+        responses = await asyncio.gather(
+            async_client.post(signup_url("Chess Club", "student1@mergington.edu")),
+            async_client.post(signup_url("Chess Club", "student2@mergington.edu")),
+        )
+        assert all(r.status_code == 200 for r in responses)
         
-        response = client.get("/activities")
-        data = response.json()
-        participants = data["Chess Club"]["participants"]
-        assert "student1@mergington.edu" in participants
-        assert "student2@mergington.edu" in participants
+        participants = activities["Chess Club"]["participants"]
+        assert set(participants) >= {"student1@mergington.edu", "student2@mergington.edu"}
         assert len(participants) == 4  # 2 original + 2 new
 
 
@@ -135,79 +175,67 @@ class TestRemoveParticipant:
 
     def test_remove_existing_participant(self, client):
         """Test removing an existing participant from an activity"""
-        response = client.delete(
-            "/activities/Chess%20Club/participants/michael@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "message" in data
-        assert "michael@mergington.edu" in data["message"]
-        assert "Chess Club" in data["message"]
+        response = client.delete(participant_url("Chess Club", "michael@mergington.edu"))
+        assert_ok_message(response, "michael@mergington.edu", "Chess Club")
 
-    def test_remove_participant_actually_removes(self, client):
+    def test_remove_participant_actually_removes(self, client, activities):
         """Test that delete actually removes the participant"""
-        client.delete("/activities/Chess%20Club/participants/michael@mergington.edu")
+        client.delete(participant_url("Chess Club", "michael@mergington.edu"))
         
         # Verify participant was removed
-        response = client.get("/activities")
-        data = response.json()
-        assert "michael@mergington.edu" not in data["Chess Club"]["participants"]
-        assert len(data["Chess Club"]["participants"]) == 1
-
-    def test_remove_participant_from_nonexistent_activity(self, client):
-        """Test removing a participant from an activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent%20Club/participants/test@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
-
-    def test_remove_nonexistent_participant(self, client):
-        """Test removing a participant who is not in the activity"""
-        response = client.delete(
-            "/activities/Chess%20Club/participants/nonexistent@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Participant not found" in data["detail"]
+        participants = activities["Chess Club"]["participants"]
+        assert "michael@mergington.edu" not in participants
+        assert len(participants) == 1
 
-    def test_remove_all_participants(self, client):
+    @pytest.mark.asyncio
+    async def test_remove_all_participants(self, async_client, activities):
         """Test removing all participants from an activity"""
-        client.delete("/activities/Chess%20Club/participants/michael@mergington.edu")
-        client.delete("/activities/Chess%20Club/participants/daniel@mergington.edu")
+        responses = await asyncio.gather(
+            async_client.delete(participant_url("Chess Club", "michael@mergington.edu")),
+            async_client.delete(participant_url("Chess Club", "daniel@mergington.edu")),
+        )
+        assert all(r.status_code == 200 for r in responses)
         
-        response = client.get("/activities")
-        data = response.json()
-        assert len(data["Chess Club"]["participants"]) == 0
+        assert len(activities["Chess Club"]["participants"]) == 0
+
+
+class TestNotFound:
+    """Tests for 404 responses from the signup and remove endpoints"""
+
+    @pytest.mark.parametrize("method,url,detail", [
+        ("post", signup_url("Nonexistent Club", "test@mergington.edu"),
+         "Activity not found"),
+        ("delete", participant_url("Nonexistent Club", "test@mergington.edu"),
+         "Activity not found"),
+        ("delete", participant_url("Chess Club", "nonexistent@mergington.edu"),
+         "Participant not found"),
+    ], ids=["signup-missing-activity", "remove-missing-activity", "remove-missing-participant"])
+    def test_not_found(self, client, method, url, detail):
+        """Test requests for a missing activity or participant return 404"""
+        response = getattr(client, method)(url)
+        assert response.status_code == 404
+        assert b'"detail"' in response.content
+        assert detail.encode() in response.content
 
 
 class TestIntegration:
     """Integration tests for the full workflow"""
 
-    def test_signup_and_remove_workflow(self, client):
+    def test_signup_and_remove_workflow(self, client, activities):
         """Test the full workflow of signing up and removing a participant"""
         # Sign up a new student
-        signup_response = client.post(
-            "/activities/Programming%20Class/signup?email=newstudent@mergington.edu"
-        )
-        assert signup_response.status_code == 200
+        signup_response = client.post(signup_url("Programming Class", "newstudent@mergington.edu"))
+        assert_ok_message(signup_response, "newstudent@mergington.edu")
         
         # Verify they're in the list
-        activities_response = client.get("/activities")
-        data = activities_response.json()
-        assert "newstudent@mergington.edu" in data["Programming Class"]["participants"]
+        assert "newstudent@mergington.edu" in activities["Programming Class"]["participants"]
         
         # Remove the student
-        remove_response = client.delete(
-            "/activities/Programming%20Class/participants/newstudent@mergington.edu"
-        )
-        assert remove_response.status_code == 200
+        remove_response = client.delete(participant_url("Programming Class", "newstudent@mergington.edu"))
+        assert_ok_message(remove_response, "newstudent@mergington.edu")
         
         # Verify they're removed
-        final_response = client.get("/activities")
-        final_data = final_response.json()
-        assert "newstudent@mergington.edu" not in final_data["Programming Class"]["participants"]
+        assert "newstudent@mergington.edu" not in activities["Programming Class"]["participants"]
 
     def test_activity_capacity_tracking(self, client):
         """Test that we can track activity capacity correctly"""